@@ -1,12 +1,11 @@
 """Entry point for Cosmo's Dungeon — python3 -m game."""
 
 import curses
+import os
+import sys
 
-from .dungeon import main
+from .dungeon import Game
 
 if __name__ == "__main__":
-    try:
-        curses.wrapper(main)
-    except KeyboardInterrupt:
-        pass
-    print("\nThanks for playing Cosmo's Dungeon!")
+    curses.wrapper(lambda stdscr: Game(stdscr).run())
+    os.write(sys.stdout.fileno(), b"\nThanks for playing Cosmo's Dungeon!\n")
@@ -2,16 +2,23 @@
 """Cosmo's Dungeon - A terminal roguelike dungeon crawler."""
 
 import curses
+import curses.panel
 import os
 import random
+import signal
 import sys
 import time
+from collections import deque
+from itertools import islice
 
-# ── Tile characters ──────────────────────────────────────────────────────────
-WALL = "#"
-FLOOR = "."
-DOOR = "+"
-STAIRS = ">"
+# ── Tile codes (one byte per cell in DungeonLevel.tiles) ─────────────────────
+WALL = 0
+FLOOR = 1
+DOOR = 2
+STAIRS = 3
+TILE_CHARS = ("#", ".", "+", ">")
+
+# ── Entity characters ────────────────────────────────────────────────────────
 PLAYER = "@"
 POTION = "!"
 WEAPON = "/"
@@ -19,6 +26,10 @@ GOLD = "$"
 SCROLL = "?"
 MERCHANT = "M"
 
+# Status-bar HP gauge, one prebuilt string per fill level
+HP_BAR_LEN = 15
+HP_BARS = tuple("\u2588" * i + "\u2591" * (HP_BAR_LEN - i) for i in range(HP_BAR_LEN + 1))
+
 # ── Color pairs ──────────────────────────────────────────────────────────────
 C_DEFAULT = 0
 C_PLAYER = 1
@@ -44,6 +55,20 @@ MONSTER_DEFS = [
     {"ch": "D", "name": "dragon",      "hp": 60, "atk": 15, "xp": 100,"color": C_DANGER},
 ]
 
+# MONSTER_DEFS split into per-field tuples, indexed by tier
+MD_CH = tuple(md["ch"] for md in MONSTER_DEFS)
+MD_NAME = tuple(md["name"] for md in MONSTER_DEFS)
+MD_HP = tuple(md["hp"] for md in MONSTER_DEFS)
+MD_ATK = tuple(md["atk"] for md in MONSTER_DEFS)
+MD_XP = tuple(md["xp"] for md in MONSTER_DEFS)
+MD_COLOR = tuple(md["color"] for md in MONSTER_DEFS)
+
+# Octant transforms (xx, xy, yx, yy) for shadowcasting field of view
+FOV_OCTANTS = [
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+]
+
 WEAPON_NAMES = [
     ("rusty dagger",   2),
     ("short sword",    4),
@@ -54,6 +79,20 @@ WEAPON_NAMES = [
     ("enchanted blade",15),
 ]
 
+# Key -> (dx, dy) for arrows, WASD, vi keys and vi diagonals
+MOVE_KEYS = {
+    curses.KEY_UP: (0, -1), ord("w"): (0, -1), ord("k"): (0, -1),
+    curses.KEY_DOWN: (0, 1), ord("s"): (0, 1), ord("j"): (0, 1),
+    curses.KEY_LEFT: (-1, 0), ord("a"): (-1, 0), ord("h"): (-1, 0),
+    curses.KEY_RIGHT: (1, 0), ord("d"): (1, 0), ord("l"): (1, 0),
+    ord("y"): (-1, -1), ord("u"): (1, -1), ord("b"): (-1, 1), ord("n"): (1, 1),
+}
+
+_KEY_Q = ord("q")
+_KEY_SPACE = ord(" ")
+# Keys the win screen reacts to; anything else is dropped before dispatch
+_WIN_KEYS = frozenset((_KEY_Q, _KEY_SPACE, curses.KEY_RESIZE))
+
 SCROLL_EFFECTS = [
     ("fireball",    "damage"),
     ("lightning",   "damage"),
@@ -84,29 +123,35 @@ def _item_desc(kind, value):
 
 def _generate_merchant_stock(depth):
     """Build a fixed shop inventory for a merchant on this depth."""
+    randint = random.randint
+    rnd = random.random
     stock = []
     # 1-2 potions
-    for _ in range(random.randint(1, 2)):
-        heal = random.randint(10, 20) + depth * 2
-        price = random.randint(15, 25)
+    for _ in range(1 + (rnd() < 0.5)):
+        heal = randint(10, 20) + depth * 2
+        price = randint(15, 25)
         stock.append({"ch": POTION, "name": f"potion (+{heal} HP)", "color": C_HEAL,
                        "kind": "potion", "value": heal, "price": price})
     # 1 weapon
-    tier = min(random.randint(0, depth + 1), len(WEAPON_NAMES) - 1)
+    tier = min(randint(0, depth + 1), len(WEAPON_NAMES) - 1)
     name, bonus = WEAPON_NAMES[tier]
     price = 20 + bonus * 3
     stock.append({"ch": WEAPON, "name": name, "color": C_ITEM,
                    "kind": "weapon", "value": bonus, "price": price})
     # 1-2 scrolls
-    for _ in range(random.randint(1, 2)):
+    for _ in range(1 + (rnd() < 0.5)):
         effect = random.choice(SCROLL_EFFECTS)
-        price = random.randint(30, 50)
+        price = randint(30, 50)
         stock.append({"ch": SCROLL, "name": f"scroll of {effect[0]}", "color": C_ITEM,
                        "kind": "scroll", "value": effect, "price": price})
     return stock
 
 
 class Entity:
+    # Monsters and floor items live in DungeonLevel's arrays; Entity covers
+    # the player, the merchant (stock) and carried items (kind, value).
+    __slots__ = ("x", "y", "ch", "name", "color", "kind", "value", "stock")
+
     def __init__(self, x, y, ch, name, color, **kw):
         self.x, self.y = x, y
         self.ch = ch
@@ -117,6 +162,10 @@ class Entity:
 
 
 class Player(Entity):
+    __slots__ = ("max_hp", "hp", "base_atk", "atk_bonus", "defense", "xp",
+                 "level", "gold", "weapon", "kills", "depth", "max_depth",
+                 "inventory")
+
     def __init__(self, x, y):
         super().__init__(x, y, PLAYER, "you", C_PLAYER)
         self.max_hp = 30
@@ -143,12 +192,14 @@ class Player(Entity):
     def gain_xp(self, amount):
         self.xp += amount
         leveled = False
-        while self.xp >= self.xp_to_next():
-            self.xp -= self.xp_to_next()
+        threshold = self.level * 20
+        while self.xp >= threshold:
+            self.xp -= threshold
             self.level += 1
             self.max_hp += 8
             self.hp = self.max_hp
             self.base_atk += 1
+            threshold = self.level * 20
             leveled = True
         return leveled
 
@@ -158,80 +209,77 @@ class DungeonLevel:
         self.w = width
         self.h = height
         self.depth = depth
-        self.tiles = [[WALL] * width for _ in range(height)]
-        self.revealed = [[False] * width for _ in range(height)]
-        self.visible = [[False] * width for _ in range(height)]
+        # Flat row-major grids: cell (x, y) lives at index y * width + x
+        self.tiles = bytearray(width * height)
+        self.revealed = bytearray(width * height)
+        self.visible = bytearray(width * height)
         self.rooms = []
-        self.monsters = []
-        self.items = []
+        # Monsters and floor items are stored as parallel arrays, one slot per
+        # entity; removal swaps the last slot into the hole.
+        self.mon_x = []
+        self.mon_y = []
+        self.mon_ch = []
+        self.mon_name = []
+        self.mon_color = []
+        self.mon_hp = []
+        self.mon_max_hp = []
+        self.mon_atk = []
+        self.mon_xp = []
+        self.item_x = []
+        self.item_y = []
+        self.item_ch = []
+        self.item_name = []
+        self.item_color = []
+        self.item_kind = []
+        self.item_value = []
+        # (x, y) -> index into the arrays above, kept in sync on every change
+        self.mon_pos = {}
+        self.item_pos = {}
+        # Indices of monsters near enough to the player to take a turn
+        self.active = []
         self.stairs_pos = None
         self.merchant = None
         self._generate()
 
     def _generate(self):
-        num_rooms = random.randint(5, 9)
-        for _ in range(200):
-            if len(self.rooms) >= num_rooms:
-                break
-            rw = random.randint(5, 12)
-            rh = random.randint(4, 8)
-            rx = random.randint(1, self.w - rw - 2)
-            ry = random.randint(1, self.h - rh - 2)
-            room = (rx, ry, rw, rh)
-            if not any(self._rooms_overlap(room, r) for r in self.rooms):
-                self._carve_room(room)
-                if self.rooms:
-                    self._connect(self.rooms[-1], room)
-                self.rooms.append(room)
+        # Generation makes hundreds of RNG calls; bind them as locals
+        randint = random.randint
+        rnd = random.random
+        self.rooms = self._bsp_split(0, 0, self.w, self.h, 3)
 
         # Place stairs in last room (no stairs on depth 8 — it's the final floor)
         if self.depth < 8:
             lr = self.rooms[-1]
             sx = lr[0] + lr[2] // 2
             sy = lr[1] + lr[3] // 2
-            self.tiles[sy][sx] = STAIRS
+            self.tiles[sy * self.w + sx] = STAIRS
             self.stairs_pos = (sx, sy)
 
         # Place monsters
-        for room in self.rooms[1:]:
-            n = random.randint(0, 2 + self.depth // 2)
+        for rx, ry, rw, rh in self.rooms[1:]:
+            n = randint(0, 2 + self.depth // 2)
             for _ in range(n):
-                mx = random.randint(room[0] + 1, room[0] + room[2] - 2)
-                my = random.randint(room[1] + 1, room[1] + room[3] - 2)
-                if self.tiles[my][mx] == FLOOR:
-                    tier = min(random.randint(0, self.depth), len(MONSTER_DEFS) - 1)
-                    md = MONSTER_DEFS[tier]
-                    # Scale HP/ATK slightly with depth
-                    hp_scale = 1 + (self.depth - 1) * 0.15
-                    atk_scale = 1 + (self.depth - 1) * 0.1
-                    m = Entity(mx, my, md["ch"], md["name"], md["color"],
-                               hp=int(md["hp"] * hp_scale),
-                               max_hp=int(md["hp"] * hp_scale),
-                               atk=int(md["atk"] * atk_scale),
-                               xp=md["xp"])
-                    self.monsters.append(m)
+                mx = rx + 1 + int(rnd() * (rw - 2))
+                my = ry + 1 + int(rnd() * (rh - 2))
+                if self.tiles[my * self.w + mx] == FLOOR and (mx, my) not in self.mon_pos:
+                    tier = min(randint(0, self.depth), len(MD_CH) - 1)
+                    self._add_monster(mx, my, tier)
 
         # Guarantee a dragon on depth 8
-        if self.depth >= 8 and not any(m.name == "dragon" for m in self.monsters):
+        if self.depth >= 8 and "dragon" not in self.mon_name:
             lr = self.rooms[-1]
             dx = lr[0] + lr[2] // 2
             dy = lr[1] + lr[3] // 2
-            md = MONSTER_DEFS[-1]
-            hp_scale = 1 + (self.depth - 1) * 0.15
-            atk_scale = 1 + (self.depth - 1) * 0.1
-            dragon = Entity(dx, dy, md["ch"], md["name"], md["color"],
-                            hp=int(md["hp"] * hp_scale),
-                            max_hp=int(md["hp"] * hp_scale),
-                            atk=int(md["atk"] * atk_scale),
-                            xp=md["xp"])
-            self.monsters.append(dragon)
+            if (dx, dy) in self.mon_pos:
+                self.remove_monster(self.mon_pos[(dx, dy)])
+            self._add_monster(dx, dy, len(MD_CH) - 1)
 
         # Place items
-        for room in self.rooms:
-            if random.random() < 0.5:
-                ix = random.randint(room[0] + 1, room[0] + room[2] - 2)
-                iy = random.randint(room[1] + 1, room[1] + room[3] - 2)
-                if self.tiles[iy][ix] == FLOOR:
+        for rx, ry, rw, rh in self.rooms:
+            if rnd() < 0.5:
+                ix = rx + 1 + int(rnd() * (rw - 2))
+                iy = ry + 1 + int(rnd() * (rh - 2))
+                if self.tiles[iy * self.w + ix] == FLOOR:
                     self._place_item(ix, iy)
 
         # Place merchant in a random middle room (not first or last)
@@ -242,31 +290,85 @@ class DungeonLevel:
             self.merchant = Entity(mx, my, MERCHANT, "merchant", C_MERCHANT,
                                    stock=_generate_merchant_stock(self.depth))
 
+    def _bsp_split(self, x, y, w, h, depth_left):
+        """Partition the area (x, y, w, h) and carve one room per leaf.
+
+        The longer side is cut at 35-65% until depth_left runs out or the
+        halves would be too small for a room; the last level of cuts is made
+        only some of the time so the room count varies. Every leaf keeps a one-tile
+        border around its room, so rooms never touch. The two halves of each
+        split are joined by a corridor. Returns the rooms in this subtree,
+        ordered left to right and top to bottom.
+        """
+        randint = random.randint
+        vertical = w > h
+        side, least = (w, 7) if vertical else (h, 6)
+        if (depth_left > 0 and side >= 2 * least
+                and (depth_left > 1 or random.random() < 0.6)):
+            cut = randint(max(least, int(side * 0.35)),
+                          min(side - least, int(side * 0.65)))
+            if vertical:
+                first = self._bsp_split(x, y, cut, h, depth_left - 1)
+                second = self._bsp_split(x + cut, y, w - cut, h, depth_left - 1)
+            else:
+                first = self._bsp_split(x, y, w, cut, depth_left - 1)
+                second = self._bsp_split(x, y + cut, w, h - cut, depth_left - 1)
+            self._connect(first[-1], second[0])
+            return first + second
+        rw = randint(5, min(12, w - 2))
+        rh = randint(4, min(8, h - 2))
+        room = (x + 1 + randint(0, w - rw - 2), y + 1 + randint(0, h - rh - 2), rw, rh)
+        self._carve_room(room)
+        return [room]
+
+    def _add_monster(self, x, y, tier):
+        # Scale HP/ATK slightly with depth
+        hp_scale = 1 + (self.depth - 1) * 0.15
+        atk_scale = 1 + (self.depth - 1) * 0.1
+        self.mon_pos[(x, y)] = len(self.mon_x)
+        self.mon_x.append(x)
+        self.mon_y.append(y)
+        hp = int(MD_HP[tier] * hp_scale)
+        self.mon_ch.append(MD_CH[tier])
+        self.mon_name.append(MD_NAME[tier])
+        self.mon_color.append(MD_COLOR[tier])
+        self.mon_hp.append(hp)
+        self.mon_max_hp.append(hp)
+        self.mon_atk.append(int(MD_ATK[tier] * atk_scale))
+        self.mon_xp.append(MD_XP[tier])
+
+    def _add_item(self, x, y, ch, name, color, kind, value):
+        self.item_pos[(x, y)] = len(self.item_x)
+        self.item_x.append(x)
+        self.item_y.append(y)
+        self.item_ch.append(ch)
+        self.item_name.append(name)
+        self.item_color.append(color)
+        self.item_kind.append(kind)
+        self.item_value.append(value)
+
     def _place_item(self, x, y):
+        randint = random.randint
         roll = random.random()
         if roll < 0.35:
-            heal = random.randint(8, 20)
-            self.items.append(Entity(x, y, POTION, f"potion (+{heal} HP)", C_HEAL, kind="potion", value=heal))
+            heal = randint(8, 20)
+            self._add_item(x, y, POTION, f"potion (+{heal} HP)", C_HEAL, "potion", heal)
         elif roll < 0.6:
-            tier = min(random.randint(0, self.depth), len(WEAPON_NAMES) - 1)
+            tier = min(randint(0, self.depth), len(WEAPON_NAMES) - 1)
             name, bonus = WEAPON_NAMES[tier]
-            self.items.append(Entity(x, y, WEAPON, name, C_ITEM, kind="weapon", value=bonus))
+            self._add_item(x, y, WEAPON, name, C_ITEM, "weapon", bonus)
         elif roll < 0.85:
-            amount = random.randint(5, 15 + self.depth * 5)
-            self.items.append(Entity(x, y, GOLD, f"{amount} gold", C_GOLD, kind="gold", value=amount))
+            amount = randint(5, 15 + self.depth * 5)
+            self._add_item(x, y, GOLD, f"{amount} gold", C_GOLD, "gold", amount)
         else:
             effect = random.choice(SCROLL_EFFECTS)
-            self.items.append(Entity(x, y, SCROLL, f"scroll of {effect[0]}", C_ITEM, kind="scroll", value=effect))
-
-    def _rooms_overlap(self, a, b):
-        return not (a[0] + a[2] + 1 < b[0] or b[0] + b[2] + 1 < a[0] or
-                    a[1] + a[3] + 1 < b[1] or b[1] + b[3] + 1 < a[1])
+            self._add_item(x, y, SCROLL, f"scroll of {effect[0]}", C_ITEM, "scroll", effect)
 
     def _carve_room(self, room):
         rx, ry, rw, rh = room
         for y in range(ry, ry + rh):
-            for x in range(rx, rx + rw):
-                self.tiles[y][x] = FLOOR
+            i = y * self.w + rx
+            self.tiles[i:i + rw] = bytes([FLOOR]) * rw
 
     def _connect(self, r1, r2):
         x1 = r1[0] + r1[2] // 2
@@ -275,55 +377,161 @@ class DungeonLevel:
         y2 = r2[1] + r2[3] // 2
         x, y = x1, y1
         while x != x2:
-            self.tiles[y][x] = FLOOR
+            self.tiles[y * self.w + x] = FLOOR
             x += 1 if x2 > x else -1
         while y != y2:
-            self.tiles[y][x] = FLOOR
+            self.tiles[y * self.w + x] = FLOOR
             y += 1 if y2 > y else -1
 
     def monster_at(self, x, y):
-        for m in self.monsters:
-            if m.x == x and m.y == y:
-                return m
-        return None
+        """Return the index of the monster at (x, y), or -1 if there is none."""
+        return self.mon_pos.get((x, y), -1)
 
     def item_at(self, x, y):
-        for i in self.items:
-            if i.x == x and i.y == y:
-                return i
-        return None
+        """Return the index of the item at (x, y), or -1 if there is none."""
+        return self.item_pos.get((x, y), -1)
+
+    def update_active(self, px, py):
+        """Collect the monsters within 8 tiles (Chebyshev) of (px, py).
+
+        Nothing further away can be in view, so only these get a turn; call
+        again whenever the player changes cell.
+        """
+        self.active = [i for i, (mx, my) in enumerate(zip(self.mon_x, self.mon_y))
+                       if abs(mx - px) <= 8 and abs(my - py) <= 8]
+
+    def remove_monster(self, i):
+        last = len(self.mon_x) - 1
+        del self.mon_pos[(self.mon_x[i], self.mon_y[i])]
+        if i in self.active:
+            self.active.remove(i)
+        if i != last:
+            self.mon_pos[(self.mon_x[last], self.mon_y[last])] = i
+            if last in self.active:
+                self.active[self.active.index(last)] = i
+        for arr in (self.mon_x, self.mon_y, self.mon_ch, self.mon_name,
+                    self.mon_color, self.mon_hp, self.mon_max_hp, self.mon_atk,
+                    self.mon_xp):
+            arr[i] = arr[-1]
+            arr.pop()
+
+    def take_item(self, i):
+        """Remove item i from the floor and return it as an Entity."""
+        item = Entity(self.item_x[i], self.item_y[i], self.item_ch[i],
+                      self.item_name[i], self.item_color[i],
+                      kind=self.item_kind[i], value=self.item_value[i])
+        last = len(self.item_x) - 1
+        del self.item_pos[(item.x, item.y)]
+        if i != last:
+            self.item_pos[(self.item_x[last], self.item_y[last])] = i
+        for arr in (self.item_x, self.item_y, self.item_ch, self.item_name,
+                    self.item_color, self.item_kind, self.item_value):
+            arr[i] = arr[-1]
+            arr.pop()
+        return item
 
     def is_walkable(self, x, y):
         if 0 <= x < self.w and 0 <= y < self.h:
-            return self.tiles[y][x] != WALL
+            return self.tiles[y * self.w + x] != WALL
         return False
 
     def compute_fov(self, px, py, radius=6):
-        import math
-        for row in self.visible:
-            for i in range(len(row)):
-                row[i] = False
-        for angle_step in range(360):
-            angle = angle_step * math.pi / 180
-            dx = math.cos(angle)
-            dy = math.sin(angle)
-            x, y = float(px), float(py)
-            for _ in range(radius):
-                ix, iy = int(round(x)), int(round(y))
-                if 0 <= ix < self.w and 0 <= iy < self.h:
-                    self.visible[iy][ix] = True
-                    self.revealed[iy][ix] = True
-                    if self.tiles[iy][ix] == WALL:
+        _fov_kernel(self.tiles, self.visible, self.revealed,
+                    self.w, self.h, px, py, radius)
+
+    def reveal_all(self):
+        self.revealed[:] = b"\x01" * len(self.revealed)
+
+
+def _fov_kernel(tiles, visible, revealed, w, h, px, py, radius):
+    """Shadowcast the field of view from (px, py) into visible/revealed.
+
+    Each octant is scanned row by row; the sub-wedges left open past a wall
+    are queued on an explicit stack rather than handled by recursion.
+    """
+    visible[:] = bytes(len(visible))
+    visible[py * w + px] = 1
+    revealed[py * w + px] = 1
+    radius_sq = radius * radius
+    for xx, xy, yx, yy in FOV_OCTANTS:
+        stack = [(1, 1.0, 0.0)]
+        while stack:
+            row, start_slope, end_slope = stack.pop()
+            if start_slope < end_slope:
+                continue
+            new_start = start_slope
+            for dist in range(row, radius + 1):
+                blocked = False
+                dy = -dist
+                for dx in range(-dist, 1):
+                    l_slope = (dx - 0.5) / (dy + 0.5)
+                    r_slope = (dx + 0.5) / (dy - 0.5)
+                    if start_slope < r_slope:
+                        continue
+                    if end_slope > l_slope:
                         break
-                else:
+                    x = px + dx * xx + dy * xy
+                    y = py + dx * yx + dy * yy
+                    if 0 <= x < w and 0 <= y < h:
+                        i = y * w + x
+                        if dx * dx + dy * dy <= radius_sq:
+                            visible[i] = 1
+                            revealed[i] = 1
+                        opaque = tiles[i] == WALL
+                    else:
+                        opaque = True
+                    if blocked:
+                        if opaque:
+                            new_start = r_slope
+                        else:
+                            blocked = False
+                            start_slope = new_start
+                    elif opaque and dist < radius:
+                        blocked = True
+                        stack.append((dist + 1, start_slope, l_slope))
+                        new_start = r_slope
+                if blocked:
                     break
-                x += dx
-                y += dy
 
-    def reveal_all(self):
-        for y in range(self.h):
-            for x in range(self.w):
-                self.revealed[y][x] = True
+
+def _ai_kernel(active, mon_x, mon_y, mon_atk, mon_pos, tiles, visible, w, h,
+               px, py, p_def, p_hp):
+    """Run one turn for each active monster that can see the player.
+
+    Adjacent monsters attack; others within 8 steps move one tile toward
+    the player, updating mon_x/mon_y/mon_pos in place. Returns the attacks
+    as a list of (monster index, damage) in the order they landed, stopping
+    at the hit that takes the player's p_hp to zero.
+    """
+    randint = random.randint
+    hits = []
+    for i in active:
+        mx = mon_x[i]
+        my = mon_y[i]
+        if not visible[my * w + mx]:
+            continue
+        dist = abs(mx - px) + abs(my - py)
+        if dist <= 1:
+            dmg = max(1, mon_atk[i] - p_def - randint(0, 2))
+            hits.append((i, dmg))
+            p_hp -= dmg
+            if p_hp <= 0:
+                break
+        elif dist <= 8:
+            dx = (1 if px > mx else -1) if px != mx else 0
+            dy = (1 if py > my else -1) if py != my else 0
+            nx, ny = mx + dx, my
+            if not (dx != 0 and 0 <= nx < w and tiles[ny * w + nx] != WALL
+                    and (nx, ny) not in mon_pos):
+                nx, ny = mx, my + dy
+                if not (dy != 0 and 0 <= ny < h and tiles[ny * w + nx] != WALL
+                        and (nx, ny) not in mon_pos):
+                    continue
+            del mon_pos[(mx, my)]
+            mon_pos[(nx, ny)] = i
+            mon_x[i] = nx
+            mon_y[i] = ny
+    return hits
 
 
 def _load_text(name):
@@ -336,6 +544,18 @@ def _load_text(name):
         return []
 
 
+# ── Victory screen text (everything except the player's stats) ──────────────
+VICTORY_ART = tuple(_load_text("victory.txt") or ["VICTORY!"])
+VICTORY_ART_W = max(len(line) for line in VICTORY_ART)
+WIN_HEADER = ("THE DRAGON IS SLAIN!", "You have conquered Cosmo's Dungeon!", "")
+WIN_FOOTER = ("", "Press SPACE to play again, Q to quit")
+# Art, header, stats, blank, score and footer; the art comes from a file, so
+# count it rather than hard-coding
+WIN_LINE_COUNT = len(VICTORY_ART) + len(WIN_HEADER) + 3 + len(WIN_FOOTER)
+_STATS_FMT = "Level: {}   Max Depth: {}   Kills: {}   Gold: {}".format
+_SCORE_FMT = "Final Score: {}".format
+
+
 class Game:
     MAP_W = 70
     MAP_H = 22
@@ -343,15 +563,44 @@ class Game:
     def __init__(self, stdscr):
         self.scr = stdscr
         self.running = True
-        self.messages = []
+        self.messages = deque(maxlen=5)
+        # Status-line text for the newest messages, rebuilt only by msg()
+        self._msg_line = ""
         self.player = Player(0, 0)
         self.dungeon = None
         self.state = "title"
         self._shop_stock = []
+        # Set by anything that changes what the map screen shows
+        self._dirty = True
+        # Pre-rendered win screen and the (kills, gold, max_depth, level)
+        # tuple it was rendered for; the score is only computed on a miss
+        self._win_pad = None
+        self._win_pad_stats = None
+        # Win screen needs repainting (set on entry and on resize)
+        self._win_dirty = True
+        self._win_size = None
+        # Panel showing the visible part of the pad at the current screen size,
+        # or None to rebuild it
+        self._win_panel = None
+        self._win_prev_blocking = True
+        # Static win-screen lines pre-encoded for addstr; the art is not ASCII,
+        # so use the terminal's own encoding
+        enc = stdscr.encoding
+        self._win_art_b = tuple(line.encode(enc, "replace") for line in VICTORY_ART)
+        self._win_header_b = tuple(line.encode(enc) for line in WIN_HEADER)
+        self._win_footer_b = tuple(line.encode(enc) for line in WIN_FOOTER)
+        self._win_keys = {
+            _KEY_Q: self._quit,
+            _KEY_SPACE: self._restart,
+            curses.KEY_RESIZE: self._win_resized,
+        }
         self._init_colors()
+        # Minimum time per main-loop pass while input is non-blocking
+        self._frame_dt = 1.0 / 60
         curses.curs_set(0)
-        self.scr.nodelay(False)
+        self._set_blocking(True)
         self.scr.keypad(True)
+        self._on_resize()
 
     def _init_colors(self):
         curses.start_color()
@@ -366,11 +615,38 @@ class Game:
         curses.init_pair(C_DANGER, curses.COLOR_RED, -1)
         curses.init_pair(C_HEAL, curses.COLOR_GREEN, -1)
         curses.init_pair(C_MERCHANT, curses.COLOR_YELLOW, -1)
+        # Attribute words reused across screens
+        self._attr_gold = curses.color_pair(C_GOLD) | curses.A_BOLD
+        self._attr_ui = curses.color_pair(C_UI) | curses.A_BOLD
+        # Per-line attribute for the win screen: gold art, then UI text
+        self._win_line_attrs = ((self._attr_gold,) * len(VICTORY_ART)
+                                + (self._attr_ui,) * (WIN_LINE_COUNT - len(VICTORY_ART)))
+
+    def _set_blocking(self, blocking):
+        """Switch getch between waiting for a key and returning at once."""
+        self.scr.nodelay(not blocking)
+        self._blocking = blocking
+
+    def _on_sigint(self, signum, frame):
+        self.running = False
+        # If the signal landed outside getch, queue a key no screen binds so
+        # the next blocking getch returns at once
+        curses.ungetch(0)
+
+    def _on_resize(self):
+        """Recompute the cached screen size and map placement."""
+        self._h, self._w = self.scr.getmaxyx()
+        # Offset to center map
+        self._ox = max(0, (self._w - self.MAP_W) // 2)
+        self._oy = 1
+        self._xmax = min(self.MAP_W, self._w - self._ox)
+        self._ymax = min(self.MAP_H, self._h - 4)
+        self._dirty = True
 
     def msg(self, text):
         self.messages.append(text)
-        if len(self.messages) > 5:
-            self.messages.pop(0)
+        self._msg_line = " | ".join(islice(self.messages, max(0, len(self.messages) - 3), None))
+        self._dirty = True
 
     def new_level(self, depth):
         self.dungeon = DungeonLevel(self.MAP_W, self.MAP_H, depth)
@@ -381,23 +657,56 @@ class Game:
         self.player.x = r[0] + r[2] // 2
         self.player.y = r[1] + r[3] // 2
         self.dungeon.compute_fov(self.player.x, self.player.y)
+        self.dungeon.update_active(self.player.x, self.player.y)
+        self._dirty = True
         self.msg(f"You descend to depth {depth}.")
 
     def run(self):
-        while self.running:
-            if self.state == "title":
-                self._title_screen()
-            elif self.state == "play":
-                self._draw()
-                self._handle_input()
-            elif self.state == "dead":
-                self._death_screen()
-            elif self.state == "inventory":
-                self._inventory_screen()
-            elif self.state == "shop":
-                self._shop_screen()
-            elif self.state == "win":
-                self._win_screen()
+        # Ctrl-C ends the main loop instead of unwinding through curses; the
+        # previous handler is restored once the game stops
+        prev_sigint = signal.signal(signal.SIGINT, self._on_sigint)
+        try:
+            last_state = None
+            while self.running:
+                if self.state != last_state:
+                    # Other screens paint over the map (and may have seen a
+                    # resize), so re-measure and repaint after any switch
+                    self._on_resize()
+                    self._win_dirty = True
+                    if last_state == "win":
+                        self._set_blocking(self._win_prev_blocking)
+                        # The next win is a new run with new stats, so don't keep
+                        # the old pad around until then
+                        self._win_pad = None
+                        self._win_pad_stats = None
+                        self._win_panel = None
+                    if self.state == "win":
+                        # Nothing animates on the win screen, so sleep in getch
+                        # until a key arrives instead of polling
+                        self._win_prev_blocking = self._blocking
+                        self._set_blocking(True)
+                        curses.curs_set(0)
+                    last_state = self.state
+                if self.state == "title":
+                    self._title_screen()
+                elif self.state == "play":
+                    if self._dirty:
+                        self._draw()
+                        self._dirty = False
+                    self._handle_input()
+                elif self.state == "dead":
+                    self._death_screen()
+                elif self.state == "inventory":
+                    self._inventory_screen()
+                elif self.state == "shop":
+                    self._shop_screen()
+                elif self.state == "win":
+                    self._win_screen()
+                # A blocking getch already idles; a polling one would spin the CPU
+                if not self._blocking:
+                    time.sleep(self._frame_dt)
+        finally:
+            signal.signal(signal.SIGINT, prev_sigint)
 
     # ── Title screen ─────────────────────────────────────────────────────────
     def _title_screen(self):
@@ -434,88 +743,106 @@ class Game:
                 except curses.error:
                     pass
 
-        self.scr.refresh()
+        self.scr.noutrefresh()
+        curses.doupdate()
         self.scr.getch()
+        if not self.running:
+            return
         self.state = "play"
         self.player = Player(0, 0)
-        self.messages = []
+        self.messages = deque(maxlen=5)
+        self._msg_line = ""
         self.new_level(1)
 
     # ── Drawing ──────────────────────────────────────────────────────────────
     def _draw(self):
+        # Bind hot names once; the map loop below runs per cell
+        color_pair = curses.color_pair
+        A_BOLD = curses.A_BOLD
+        CursesError = curses.error
+        addstr = self.scr.addstr
         self.scr.erase()
-        h, w = self.scr.getmaxyx()
+        h, w = self._h, self._w
+        ox, oy = self._ox, self._oy
         d = self.dungeon
-
-        # Offset to center map
-        ox = max(0, (w - self.MAP_W) // 2)
-        oy = 1
-
-        # Draw map
-        for y in range(min(self.MAP_H, h - 4)):
-            for x in range(min(self.MAP_W, w - ox)):
-                if d.visible[y][x]:
-                    tile = d.tiles[y][x]
-                    color = C_WALL
-                    attr = 0
+        dw, tiles, visible, revealed = d.w, d.tiles, d.visible, d.revealed
+
+        # Draw map, one addstr per run of cells sharing an attribute
+        attr_wall = color_pair(C_WALL)
+        attr_floor = color_pair(C_DEFAULT)
+        attr_stairs = color_pair(C_STAIRS) | A_BOLD
+        attr_dim = color_pair(C_WALL) | curses.A_DIM
+        for y in range(self._ymax):
+            runs = []
+            run = []
+            run_start = 0
+            run_attr = None
+            for x in range(self._xmax):
+                i = y * dw + x
+                tile = tiles[i]
+                if visible[i]:
                     if tile == STAIRS:
-                        color = C_STAIRS
-                        attr = curses.A_BOLD
+                        attr = attr_stairs
                     elif tile == FLOOR:
-                        color = C_DEFAULT
-                    try:
-                        self.scr.addstr(oy + y, ox + x, tile,
-                                        curses.color_pair(color) | attr)
-                    except curses.error:
-                        pass
-                elif d.revealed[y][x]:
-                    tile = d.tiles[y][x]
-                    try:
-                        self.scr.addstr(oy + y, ox + x, tile,
-                                        curses.color_pair(C_WALL) | curses.A_DIM)
-                    except curses.error:
-                        pass
+                        attr = attr_floor
+                    else:
+                        attr = attr_wall
+                elif revealed[i]:
+                    attr = attr_dim
+                else:
+                    attr = None
+                if attr != run_attr:
+                    if run:
+                        runs.append((run_start, "".join(run), run_attr))
+                    run = []
+                    run_start = x
+                    run_attr = attr
+                if attr is not None:
+                    run.append(TILE_CHARS[tile])
+            if run:
+                runs.append((run_start, "".join(run), run_attr))
+            for x, text, attr in runs:
+                try:
+                    addstr(oy + y, ox + x, text, attr)
+                except CursesError:
+                    pass
 
         # Draw items
-        for item in d.items:
-            if d.visible[item.y][item.x]:
+        for x, y, ch, color in zip(d.item_x, d.item_y, d.item_ch, d.item_color):
+            if visible[y * dw + x]:
                 try:
-                    self.scr.addstr(oy + item.y, ox + item.x, item.ch,
-                                    curses.color_pair(item.color) | curses.A_BOLD)
-                except curses.error:
+                    addstr(oy + y, ox + x, ch, color_pair(color) | A_BOLD)
+                except CursesError:
                     pass
 
         # Draw monsters
-        for m in d.monsters:
-            if d.visible[m.y][m.x]:
+        for x, y, ch, color in zip(d.mon_x, d.mon_y, d.mon_ch, d.mon_color):
+            if visible[y * dw + x]:
                 try:
-                    self.scr.addstr(oy + m.y, ox + m.x, m.ch,
-                                    curses.color_pair(m.color) | curses.A_BOLD)
-                except curses.error:
+                    addstr(oy + y, ox + x, ch, color_pair(color) | A_BOLD)
+                except CursesError:
                     pass
 
         # Draw merchant
-        if d.merchant and d.visible[d.merchant.y][d.merchant.x]:
+        if d.merchant and visible[d.merchant.y * dw + d.merchant.x]:
             try:
-                self.scr.addstr(oy + d.merchant.y, ox + d.merchant.x,
-                                d.merchant.ch,
-                                curses.color_pair(C_MERCHANT) | curses.A_BOLD)
-            except curses.error:
+                addstr(oy + d.merchant.y, ox + d.merchant.x, d.merchant.ch,
+                       color_pair(C_MERCHANT) | A_BOLD)
+            except CursesError:
                 pass
 
         # Draw player
         try:
-            self.scr.addstr(oy + self.player.y, ox + self.player.x, PLAYER,
-                            curses.color_pair(C_PLAYER) | curses.A_BOLD)
-        except curses.error:
+            addstr(oy + self.player.y, ox + self.player.x, PLAYER,
+                   color_pair(C_PLAYER) | A_BOLD)
+        except CursesError:
             pass
 
         # ── Status bar ───────────────────────────────────────────────────────
         bar_y = oy + self.MAP_H
         p = self.player
-        hp_bar_len = 15
-        hp_filled = max(0, int(hp_bar_len * p.hp / p.max_hp))
-        hp_bar = "\u2588" * hp_filled + "\u2591" * (hp_bar_len - hp_filled)
+        hp_filled = int(HP_BAR_LEN * p.hp / p.max_hp)
+        hp_bar = HP_BARS[max(0, min(HP_BAR_LEN, hp_filled))]
         hp_color = C_HEAL if p.hp > p.max_hp * 0.3 else C_DANGER
 
         status = (f" HP [{hp_bar}] {p.hp}/{p.max_hp}  ATK:{p.atk}  DEF:{p.defense}"
@@ -523,47 +850,35 @@ class Game:
                   f"  Depth:{p.depth}  Weapon:{p.weapon} ")
         if bar_y < h:
             try:
-                self.scr.addstr(bar_y, 0, status[:w - 1],
-                                curses.color_pair(hp_color) | curses.A_BOLD)
-            except curses.error:
+                addstr(bar_y, 0, status[:w - 1], color_pair(hp_color) | A_BOLD)
+            except CursesError:
                 pass
 
         # ── Messages ─────────────────────────────────────────────────────────
         msg_y = 0
-        if self.messages and msg_y < h:
-            line = " | ".join(self.messages[-3:])
+        if self._msg_line and msg_y < h:
             try:
-                self.scr.addstr(msg_y, 0, line[:w - 1], curses.color_pair(C_UI))
-            except curses.error:
+                addstr(msg_y, 0, self._msg_line[:w - 1], color_pair(C_UI))
+            except CursesError:
                 pass
 
-        self.scr.refresh()
+        self.scr.noutrefresh()
+        curses.doupdate()
 
     # ── Input ────────────────────────────────────────────────────────────────
     def _handle_input(self):
         key = self.scr.getch()
-        dx, dy = 0, 0
 
         # Movement
-        if key in (curses.KEY_UP, ord("w"), ord("k")):
-            dy = -1
-        elif key in (curses.KEY_DOWN, ord("s"), ord("j")):
-            dy = 1
-        elif key in (curses.KEY_LEFT, ord("a"), ord("h")):
-            dx = -1
-        elif key in (curses.KEY_RIGHT, ord("d"), ord("l")):
-            dx = 1
-        elif key in (ord("y"),):
-            dx, dy = -1, -1
-        elif key in (ord("u"),):
-            dx, dy = 1, -1
-        elif key in (ord("b"),):
-            dx, dy = -1, 1
-        elif key in (ord("n"),):
-            dx, dy = 1, 1
+        move = MOVE_KEYS.get(key)
+        if move:
+            self._try_move(*move)
         elif key in (ord(">"), ord("\n"), curses.KEY_ENTER):
             self._try_descend()
             return
+        elif key == curses.KEY_RESIZE:
+            self._on_resize()
+            return
         elif key == ord(".") or key == ord("5"):
             pass  # Wait
         elif key == ord("i"):
@@ -575,9 +890,6 @@ class Game:
         else:
             return
 
-        if dx != 0 or dy != 0:
-            self._try_move(dx, dy)
-
         self._monster_turns()
 
     def _try_move(self, dx, dy):
@@ -593,7 +905,7 @@ class Game:
 
         # Attack monster?
         mon = d.monster_at(nx, ny)
-        if mon:
+        if mon >= 0:
             self._attack_monster(mon)
             return
 
@@ -601,29 +913,35 @@ class Game:
             self.player.x = nx
             self.player.y = ny
             d.compute_fov(nx, ny)
+            d.update_active(nx, ny)
+            self._dirty = True
             # Pick up items
             item = d.item_at(nx, ny)
-            if item:
+            if item >= 0:
                 self._pickup(item)
 
     def _attack_monster(self, mon):
         p = self.player
+        d = self.dungeon
+        name = d.mon_name[mon]
         dmg = max(1, p.atk - random.randint(0, 2))
-        mon.hp -= dmg
-        if mon.hp <= 0:
-            self.msg(f"You slay the {mon.name}! (+{mon.xp} XP)")
-            self.dungeon.monsters.remove(mon)
+        d.mon_hp[mon] -= dmg
+        if d.mon_hp[mon] <= 0:
+            xp = d.mon_xp[mon]
+            self.msg(f"You slay the {name}! (+{xp} XP)")
+            d.remove_monster(mon)
             p.kills += 1
-            if p.gain_xp(mon.xp):
+            if p.gain_xp(xp):
                 self.msg(f"Level up! You are now level {p.level}!")
             # Check win condition
-            if mon.name == "dragon" and self.player.depth >= 8:
+            if name == "dragon" and self.player.depth >= 8:
                 self.state = "win"
         else:
-            self.msg(f"You hit the {mon.name} for {dmg} dmg. ({mon.hp}/{mon.max_hp})")
+            self.msg(f"You hit the {name} for {dmg} dmg. ({d.mon_hp[mon]}/{d.mon_max_hp[mon]})")
 
-    def _pickup(self, item):
+    def _pickup(self, idx):
         p = self.player
+        item = self.dungeon.take_item(idx)
         if item.kind == "potion":
             p.inventory.append(item)
             self.msg(f"Picked up {item.name}. (i to use)")
@@ -640,7 +958,6 @@ class Game:
         elif item.kind == "scroll":
             p.inventory.append(item)
             self.msg(f"Picked up {item.name}. (i to use)")
-        self.dungeon.items.remove(item)
 
     def _try_descend(self):
         p = self.player
@@ -655,78 +972,79 @@ class Game:
     def _monster_turns(self):
         p = self.player
         d = self.dungeon
-        for m in list(d.monsters):
-            if not d.visible[m.y][m.x]:
-                continue
-            dist = abs(m.x - p.x) + abs(m.y - p.y)
-            if dist <= 1:
-                dmg = max(1, m.atk - p.defense - random.randint(0, 2))
-                p.hp -= dmg
-                self.msg(f"The {m.name} hits you for {dmg}!")
-                if p.hp <= 0:
-                    self.state = "dead"
-                    return
-            elif dist <= 8:
-                dx = (1 if p.x > m.x else -1) if p.x != m.x else 0
-                dy = (1 if p.y > m.y else -1) if p.y != m.y else 0
-                if dx != 0 and d.is_walkable(m.x + dx, m.y) and not d.monster_at(m.x + dx, m.y):
-                    m.x += dx
-                elif dy != 0 and d.is_walkable(m.x, m.y + dy) and not d.monster_at(m.x, m.y + dy):
-                    m.y += dy
+        hits = _ai_kernel(d.active, d.mon_x, d.mon_y, d.mon_atk, d.mon_pos,
+                          d.tiles, d.visible, d.w, d.h, p.x, p.y, p.defense,
+                          p.hp)
+        for i, dmg in hits:
+            p.hp -= dmg
+            self.msg(f"The {d.mon_name[i]} hits you for {dmg}!")
+            if p.hp <= 0:
+                self.state = "dead"
+                break
+        self._dirty = True
 
     # ── Inventory ────────────────────────────────────────────────────────────
     def _inventory_screen(self):
         p = self.player
         cursor = 0
-        while True:
-            self.scr.erase()
-            h, w = self.scr.getmaxyx()
-
-            try:
-                self.scr.addstr(1, 2, "=== INVENTORY ===",
-                                curses.color_pair(C_UI) | curses.A_BOLD)
-            except curses.error:
-                pass
-
-            if not p.inventory:
-                try:
-                    self.scr.addstr(3, 4, "Your pack is empty.",
-                                    curses.color_pair(C_UI))
-                except curses.error:
-                    pass
-            else:
-                for i, item in enumerate(p.inventory):
-                    pointer = ">" if i == cursor else " "
-                    desc = _item_desc(item.kind, item.value) if hasattr(item, 'kind') else ""
-                    label = f"{pointer} {item.ch} {item.name}  {desc}" if desc else f"{pointer} {item.ch} {item.name}"
-                    color = C_PLAYER if i == cursor else C_UI
-                    attr = curses.A_BOLD if i == cursor else 0
-                    try:
-                        self.scr.addstr(3 + i, 4, label,
-                                        curses.color_pair(color) | attr)
-                    except curses.error:
-                        pass
-
-            try:
-                self.scr.addstr(h - 2, 2, "Up/Down to select, ENTER to use, ESC/i to close",
-                                curses.color_pair(C_UI))
-            except curses.error:
-                pass
-
-            self.scr.refresh()
+        dirty = True
+        while self.running and self.state == "inventory":
+            if dirty:
+                self._render_inventory(cursor)
+                dirty = False
             key = self.scr.getch()
 
             if key == 27 or key == ord("i"):
                 self.state = "play"
-                return
-            elif key in (curses.KEY_UP, ord("k")) and p.inventory:
+            elif key in (curses.KEY_UP, ord("k")) and len(p.inventory) > 1:
                 cursor = (cursor - 1) % len(p.inventory)
-            elif key in (curses.KEY_DOWN, ord("j")) and p.inventory:
+                dirty = True
+            elif key in (curses.KEY_DOWN, ord("j")) and len(p.inventory) > 1:
                 cursor = (cursor + 1) % len(p.inventory)
+                dirty = True
             elif key in (ord("\n"), curses.KEY_ENTER) and p.inventory:
                 self._use_item(cursor)
                 self.state = "play"
-                return
+            elif key == curses.KEY_RESIZE:
+                dirty = True
+
+    def _render_inventory(self, cursor):
+        p = self.player
+        self.scr.erase()
+        h, w = self.scr.getmaxyx()
+
+        try:
+            self.scr.addstr(1, 2, "=== INVENTORY ===", self._attr_ui)
+        except curses.error:
+            pass
+
+        if not p.inventory:
+            try:
+                self.scr.addstr(3, 4, "Your pack is empty.",
+                                curses.color_pair(C_UI))
+            except curses.error:
+                pass
+        else:
+            for i, item in enumerate(p.inventory):
+                pointer = ">" if i == cursor else " "
+                desc = _item_desc(item.kind, item.value) if hasattr(item, 'kind') else ""
+                label = f"{pointer} {item.ch} {item.name}  {desc}" if desc else f"{pointer} {item.ch} {item.name}"
+                color = C_PLAYER if i == cursor else C_UI
+                attr = curses.A_BOLD if i == cursor else 0
+                try:
+                    self.scr.addstr(3 + i, 4, label,
+                                    curses.color_pair(color) | attr)
+                except curses.error:
+                    pass
+
+        try:
+            self.scr.addstr(h - 2, 2, "Up/Down to select, ENTER to use, ESC/i to close",
+                            curses.color_pair(C_UI))
+        except curses.error:
+            pass
+
+        self.scr.noutrefresh()
+        curses.doupdate()
 
     def _use_item(self, idx):
         p = self.player
@@ -738,16 +1056,18 @@ class Game:
         elif item.kind == "scroll":
             name, effect = item.value
             if effect == "damage":
+                d = self.dungeon
                 total = 0
-                for m in list(self.dungeon.monsters):
-                    if self.dungeon.visible[m.y][m.x]:
+                # Walk backwards: swap-removal only moves an already-visited slot
+                for i in range(len(d.mon_x) - 1, -1, -1):
+                    if d.visible[d.mon_y[i] * d.w + d.mon_x[i]]:
                         dmg = random.randint(10, 25)
-                        m.hp -= dmg
+                        d.mon_hp[i] -= dmg
                         total += 1
-                        if m.hp <= 0:
-                            self.dungeon.monsters.remove(m)
+                        if d.mon_hp[i] <= 0:
                             p.kills += 1
-                            p.gain_xp(m.xp)
+                            p.gain_xp(d.mon_xp[i])
+                            d.remove_monster(i)
                 self.msg(f"The scroll of {name} blasts {total} creatures!")
             elif effect == "heal":
                 p.hp = p.max_hp
@@ -762,64 +1082,27 @@ class Game:
                 self.dungeon.reveal_all()
                 self.msg("The dungeon layout is revealed!")
         p.inventory.pop(idx)
+        self._dirty = True
 
     # ── Shop ─────────────────────────────────────────────────────────────────
     def _shop_screen(self):
         p = self.player
         cursor = 0
-        while True:
-            self.scr.erase()
-            h, w = self.scr.getmaxyx()
-
-            try:
-                self.scr.addstr(1, 2, "=== MERCHANT'S SHOP ===",
-                                curses.color_pair(C_MERCHANT) | curses.A_BOLD)
-                self.scr.addstr(2, 2, f"Your gold: {p.gold}",
-                                curses.color_pair(C_GOLD) | curses.A_BOLD)
-            except curses.error:
-                pass
-
-            if not self._shop_stock:
-                try:
-                    self.scr.addstr(4, 4, "Sold out!",
-                                    curses.color_pair(C_UI))
-                except curses.error:
-                    pass
-            else:
-                for i, entry in enumerate(self._shop_stock):
-                    pointer = ">" if i == cursor else " "
-                    desc = _item_desc(entry["kind"], entry["value"])
-                    line = f"{pointer} {entry['ch']} {entry['name']}  {desc}  - {entry['price']}g"
-                    affordable = p.gold >= entry["price"]
-                    if not affordable:
-                        color = C_DANGER
-                    elif i == cursor:
-                        color = C_PLAYER
-                    else:
-                        color = C_UI
-                    attr = curses.A_BOLD if i == cursor else 0
-                    try:
-                        self.scr.addstr(4 + i, 4, line,
-                                        curses.color_pair(color) | attr)
-                    except curses.error:
-                        pass
-
-            try:
-                self.scr.addstr(h - 2, 2, "Up/Down to select, ENTER to buy, ESC to leave",
-                                curses.color_pair(C_UI))
-            except curses.error:
-                pass
-
-            self.scr.refresh()
+        dirty = True
+        while self.running and self.state == "shop":
+            if dirty:
+                self._render_shop(cursor)
+                dirty = False
             key = self.scr.getch()
 
             if key == 27:
                 self.state = "play"
-                return
-            elif key in (curses.KEY_UP, ord("k")) and self._shop_stock:
+            elif key in (curses.KEY_UP, ord("k")) and len(self._shop_stock) > 1:
                 cursor = (cursor - 1) % len(self._shop_stock)
-            elif key in (curses.KEY_DOWN, ord("j")) and self._shop_stock:
+                dirty = True
+            elif key in (curses.KEY_DOWN, ord("j")) and len(self._shop_stock) > 1:
                 cursor = (cursor + 1) % len(self._shop_stock)
+                dirty = True
             elif key in (ord("\n"), curses.KEY_ENTER) and self._shop_stock:
                 entry = self._shop_stock[cursor]
                 price = entry["price"]
@@ -841,8 +1124,57 @@ class Game:
                     self._shop_stock.pop(cursor)
                     if cursor >= len(self._shop_stock) and self._shop_stock:
                         cursor = len(self._shop_stock) - 1
+                    dirty = True
                 else:
                     self.msg("You can't afford that!")
+            elif key == curses.KEY_RESIZE:
+                dirty = True
+
+    def _render_shop(self, cursor):
+        p = self.player
+        self.scr.erase()
+        h, w = self.scr.getmaxyx()
+
+        try:
+            self.scr.addstr(1, 2, "=== MERCHANT'S SHOP ===",
+                            curses.color_pair(C_MERCHANT) | curses.A_BOLD)
+            self.scr.addstr(2, 2, f"Your gold: {p.gold}", self._attr_gold)
+        except curses.error:
+            pass
+
+        if not self._shop_stock:
+            try:
+                self.scr.addstr(4, 4, "Sold out!",
+                                curses.color_pair(C_UI))
+            except curses.error:
+                pass
+        else:
+            for i, entry in enumerate(self._shop_stock):
+                pointer = ">" if i == cursor else " "
+                desc = _item_desc(entry["kind"], entry["value"])
+                line = f"{pointer} {entry['ch']} {entry['name']}  {desc}  - {entry['price']}g"
+                affordable = p.gold >= entry["price"]
+                if not affordable:
+                    color = C_DANGER
+                elif i == cursor:
+                    color = C_PLAYER
+                else:
+                    color = C_UI
+                attr = curses.A_BOLD if i == cursor else 0
+                try:
+                    self.scr.addstr(4 + i, 4, line,
+                                    curses.color_pair(color) | attr)
+                except curses.error:
+                    pass
+
+        try:
+            self.scr.addstr(h - 2, 2, "Up/Down to select, ENTER to buy, ESC to leave",
+                            curses.color_pair(C_UI))
+        except curses.error:
+            pass
+
+        self.scr.noutrefresh()
+        curses.doupdate()
 
     # ── Death screen ─────────────────────────────────────────────────────────
     def _death_screen(self):
@@ -878,12 +1210,12 @@ class Game:
             x = max(0, w // 2 - len(line) // 2)
             if row < h:
                 try:
-                    self.scr.addstr(row, x, line,
-                                    curses.color_pair(C_UI) | curses.A_BOLD)
+                    self.scr.addstr(row, x, line, self._attr_ui)
                 except curses.error:
                     pass
 
-        self.scr.refresh()
+        self.scr.noutrefresh()
+        curses.doupdate()
         key = self.scr.getch()
         if key == ord("q"):
             self.running = False
@@ -891,63 +1223,97 @@ class Game:
             self.state = "title"
 
     # ── Win screen ───────────────────────────────────────────────────────────
+    def _build_win_layout(self, stats, score):
+        """Return the pad width and a (row, x, bytes, attr) tuple per line."""
+        kills, gold, max_depth, level = stats
+        stats_line = _STATS_FMT(level, max_depth, kills, gold)
+        score_line = _SCORE_FMT(score)
+        info = WIN_HEADER + (stats_line, "", score_line) + WIN_FOOTER
+        enc = self.scr.encoding
+        info_b = self._win_header_b + (
+            stats_line.encode(enc), b"", score_line.encode(enc)
+        ) + self._win_footer_b
+        pw = max(VICTORY_ART_W, max(len(line) for line in info))
+
+        # Pad coordinates: art block-centered, info lines individually
+        # centered (widths come from the str forms)
+        xs = ((pw - VICTORY_ART_W) // 2,) * len(VICTORY_ART) + tuple(
+            (pw - len(line)) // 2 for line in info)
+        layout = list(zip(range(WIN_LINE_COUNT), xs, self._win_art_b + info_b,
+                          self._win_line_attrs))
+        return pw, layout
+
+    def _build_win_pad(self, stats, score):
+        """Render the victory art and stats into an off-screen pad."""
+        pw, layout = self._build_win_layout(stats, score)
+        # One spare row and column so writing the last cell never errors
+        pad = curses.newpad(WIN_LINE_COUNT + 1, pw + 1)
+        for line in layout:
+            pad.addstr(*line)
+        return pad
+
     def _win_screen(self):
-        self.scr.erase()
         h, w = self.scr.getmaxyx()
-        p = self.player
-
-        art = _load_text("victory.txt") or ["VICTORY!"]
-        info = [
-            "THE DRAGON IS SLAIN!",
-            "You have conquered Cosmo's Dungeon!",
-            "",
-            f"Level: {p.level}   Max Depth: {p.max_depth}   Kills: {p.kills}   Gold: {p.gold}",
-            "",
-            f"Final Score: {p.kills * 10 + p.gold + p.max_depth * 50 + p.level * 25}",
-            "",
-            "Press SPACE to play again, Q to quit",
-        ]
-        all_lines = art + info
-        art_w = max((len(l) for l in art), default=0)
-        sy = max(0, h // 2 - len(all_lines) // 2)
+        if (h, w) != self._win_size:
+            self._win_size = (h, w)
+            self._win_dirty = True
+            self._win_panel = None
 
-        # Draw art block-centered
-        ox = max(0, w // 2 - art_w // 2)
-        for i, line in enumerate(art):
-            if sy + i < h:
-                try:
-                    self.scr.addstr(sy + i, ox, line,
-                                    curses.color_pair(C_GOLD) | curses.A_BOLD)
-                except curses.error:
-                    pass
+        if self._win_dirty:
+            self.scr.erase()
+            p = self.player
+            stats = (p.kills, p.gold, p.max_depth, p.level)
+            if self._win_pad is None or stats != self._win_pad_stats:
+                score = p.kills * 10 + p.gold + p.max_depth * 50 + p.level * 25
+                self._win_pad = self._build_win_pad(stats, score)
+                self._win_pad_stats = stats
+                self._win_panel = None
+
+            if self._win_panel is None:
+                # Center the pad and clip it to the screen up front, so neither
+                # the window nor the copy into it can fail. On screens narrower
+                # than the pad, crop around its centre so the centred info
+                # lines stay whole
+                pw = self._win_pad.getmaxyx()[1] - 1
+                sy = max(0, h // 2 - WIN_LINE_COUNT // 2)
+                sx = max(0, w // 2 - pw // 2)
+                px = max(0, (pw - w) // 2)
+                rows = min(WIN_LINE_COUNT, h - sy)
+                cols = min(pw, w - sx)
+                if rows > 0 and cols > 0:
+                    win = curses.newwin(rows, cols, sy, sx)
+                    self._win_pad.overwrite(win, 0, px, 0, 0, rows - 1, cols - 1)
+                    self._win_panel = curses.panel.new_panel(win)
+            else:
+                # stdscr was just erased; mark the kept panel's window as
+                # changed so update_panels copies it back on top
+                self._win_panel.window().touchwin()
 
-        # Draw info lines individually centered
-        for i, line in enumerate(info):
-            row = sy + len(art) + i
-            x = max(0, w // 2 - len(line) // 2)
-            if row < h:
-                try:
-                    self.scr.addstr(row, x, line,
-                                    curses.color_pair(C_UI) | curses.A_BOLD)
-                except curses.error:
-                    pass
+            self.scr.noutrefresh()
+            curses.panel.update_panels()
+            curses.doupdate()
+            self._win_dirty = False
 
-        self.scr.refresh()
         key = self.scr.getch()
-        if key == ord("q"):
-            self.running = False
-        elif key == ord(" "):
-            self.state = "title"
+        if key not in _WIN_KEYS:
+            return
+        self._win_keys[key]()
 
+    def _quit(self):
+        self.running = False
 
-def main(stdscr):
-    game = Game(stdscr)
-    game.run()
+    def _restart(self):
+        # Hiding the panel lets curses work out what to repaint underneath
+        if self._win_panel is not None:
+            self._win_panel.hide()
+            curses.panel.update_panels()
+            curses.doupdate()
+        self.state = "title"
+
+    def _win_resized(self):
+        self._win_dirty = True
 
 
 if __name__ == "__main__":
-    try:
-        curses.wrapper(main)
-    except KeyboardInterrupt:
-        pass
-    print("\nThanks for playing Cosmo's Dungeon!")
+    curses.wrapper(lambda stdscr: Game(stdscr).run())
+    os.write(sys.stdout.fileno(), b"\nThanks for playing Cosmo's Dungeon!\n")